@@ -1,17 +1,84 @@
+from collections import OrderedDict
 from collections.abc import Generator
 from typing import Dict, List, Optional, Any
+import functools
+import hashlib
+import io
 import mimetypes
 import os
+import re
+import sys
 import logging
+import asyncio
+import threading
+import time
+import types
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from datetime import datetime
+import httpx
 import requests
-from azure.storage.blob import BlobServiceClient, ContainerClient
-from azure.core.exceptions import AzureError, ResourceNotFoundError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.storage.blob import BlobPrefix, BlobServiceClient, ContainerClient
+from azure.storage.blob.aio import BlobServiceClient as AioBlobServiceClient
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import AzureError, ClientAuthenticationError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
 
 # Setup logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Default number of parallel connections used by the SDK for ranged downloads
+DEFAULT_MAX_CONCURRENCY = max(8, (os.cpu_count() or 4) * 2)
+# Bytes fetched per ranged download_blob() call, yielded as one partial message
+DOWNLOAD_BATCH_SIZE = 100 * 1024 * 1024
+# Minimum connection pool size of the shared SDK transport
+CLIENT_POOL_MAXSIZE = 32
+
+# Ranged SAS HTTP download settings
+SAS_SINGLE_GET_MAX_SIZE = 50 * 1024 * 1024  # at or below this, one GET for the whole blob
+SAS_MAX_WORKERS = 16
+SAS_BATCH_SIZE = 100 * 1024 * 1024  # 100MB per partial message, split into one ranged GET per worker
+
+# Shared keep-alive client so SAS downloads reuse connections (Blob Storage only
+# negotiates HTTP/1.1, so each parallel ranged GET holds its own connection)
+_sas_http_client = httpx.Client(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    timeout=60.0,
+)
+
+# Blob/container properties cache shared across invocations: (namespace, key) -> (expires_at, value)
+META_CACHE_TTL = 30  # seconds
+META_CACHE_MAX_ENTRIES = 10000
+_meta_cache: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
+_meta_cache_lock = threading.Lock()
+
+# Extension -> MIME type lookup, built once instead of mimetypes.guess_type() per blob
+mimetypes.init()
+_EXT2MIME = {ext.lower(): mime_type for ext, mime_type in mimetypes.types_map.items()}
+
+# Worker threads for hedged listing requests
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="azure-blob-hedge")
+
+# Background prefetch of the next listing page: (namespace, scope, token) -> (expires_at, future)
+PREFETCH_TTL = 60  # seconds
+PREFETCH_WAIT_TIMEOUT = 5  # seconds
+PREFETCH_MAX_PAGES = 32
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="azure-blob-prefetch")
+_page_cache: Dict[tuple, tuple[float, Any]] = {}
+_page_cache_lock = threading.Lock()
+
+# Async SDK download: one event loop shared by all invocations (a greenlet under the gevent-patched runtime)
+_aio_loop: Optional[asyncio.AbstractEventLoop] = None
+_aio_loop_lock = threading.Lock()
+
+# Container existence probe: 3-63 chars, lowercase letters/digits, single hyphens not at either end
+_CONTAINER_NAME_RE = re.compile(r"^[a-z0-9](?:[a-z0-9]|-(?=[a-z0-9])){2,62}$")
+_RESERVED_CONTAINER_RE = re.compile(r"^\$(root|web|logs)$")  # system containers outside the naming rules
+CONTAINER_EXISTS_TTL = 300  # seconds
+CONTAINER_MISSING_TTL = 60  # seconds
+
 from dify_plugin.entities.datasource import (
     DatasourceMessage,
     OnlineDriveBrowseFilesRequest,
@@ -23,74 +90,319 @@ from dify_plugin.entities.datasource import (
 from dify_plugin.interfaces.datasource.online_drive import OnlineDriveDatasource
 
 
+# Credential field holding the secret for each authentication method
+_SECRET_FIELDS = {
+    "account_key": "account_key",
+    "sas_token": "sas_token",
+    "connection_string": "connection_string",
+    "oauth": "access_token",
+}
+
+
+class _FingerprintedSecret:
+    """Secret wrapper hashed and compared by SHA-256 fingerprint, so cache keys never expose plaintext"""
+
+    __slots__ = ("value", "fingerprint")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.fingerprint = hashlib.sha256(value.encode()).hexdigest()
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _FingerprintedSecret) and other.fingerprint == self.fingerprint
+
+    def __repr__(self) -> str:
+        return f"<secret {self.fingerprint[:8]}>"
+
+
+class SimpleTokenCredential:
+    """Token credential wrapping an OAuth access token obtained by the provider"""
+
+    def __init__(self, token, expires_in=3600):
+        self.token = token
+        self.expires_at = int(time.time()) + expires_in
+        # Refresh 5 minutes early, checked against the monotonic clock
+        self._refresh_deadline = time.monotonic() + expires_in - 300
+
+    def get_token(self, *scopes, **kwargs):
+        if time.monotonic() >= self._refresh_deadline:
+            raise ClientAuthenticationError("Access token has expired, refresh required")
+        return AccessToken(self.token, self.expires_at)
+
+
+class AsyncSimpleTokenCredential(SimpleTokenCredential):
+    """Async variant of SimpleTokenCredential for the aio SDK client"""
+
+    async def get_token(self, *scopes, **kwargs):
+        return SimpleTokenCredential.get_token(self, *scopes, **kwargs)
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def _get_aio_loop() -> asyncio.AbstractEventLoop:
+    """Start (once) and return the shared event loop running in the background.
+
+    dify_plugin applies gevent.monkey.patch_all() on import, so threading.Thread starts a
+    greenlet here: the loop shares the main OS thread and yields to other greenlets
+    through gevent's patched selector. asyncio tracks the running loop per OS thread,
+    so once this loop is started asyncio.run() elsewhere in the process raises
+    "cannot be called from a running event loop".
+    """
+    global _aio_loop
+    with _aio_loop_lock:
+        if _aio_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="azure-blob-aio", daemon=True).start()
+            _aio_loop = loop
+        return _aio_loop
+
+
+def _create_transport(pool_size: int) -> RequestsTransport:
+    """Create HTTP transport whose connection pool can hold all parallel download connections"""
+    session = requests.Session()
+    retry_strategy = Retry(total=3, backoff_factor=0.2)
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=max(pool_size, CLIENT_POOL_MAXSIZE),
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_client(auth_method: str, account_name: str, endpoint_suffix: str,
+                  secret: _FingerprintedSecret, max_concurrency: int) -> BlobServiceClient:
+    """Build Blob service client, cached per credential fingerprint"""
+    transport = _create_transport(max_concurrency)
+    
+    if auth_method == "account_key":
+        account_url = f"https://{account_name}.blob.{endpoint_suffix}"
+        return BlobServiceClient(
+            account_url=account_url, 
+            credential=secret.value,
+            transport=transport
+        )
+        
+    elif auth_method == "sas_token":
+        sas_token = secret.value
+        if not sas_token.startswith('?'):
+            sas_token = '?' + sas_token
+        account_url = f"https://{account_name}.blob.{endpoint_suffix}"
+        return BlobServiceClient(
+            account_url=account_url + sas_token,
+            transport=transport
+        )
+        
+    elif auth_method == "connection_string":
+        return BlobServiceClient.from_connection_string(
+            secret.value,
+            transport=transport
+        )
+        
+    elif auth_method == "oauth":
+        account_url = f"https://{account_name}.blob.{endpoint_suffix}"
+        
+        # Create simple token credential
+        credential = SimpleTokenCredential(secret.value)
+        return BlobServiceClient(
+            account_url=account_url, 
+            credential=credential,
+            transport=transport
+        )
+        
+    else:
+        raise ValueError(f"Unsupported authentication method: {auth_method}")
+
+
+@functools.lru_cache(maxsize=32)
+def _build_aio_client(auth_method: str, account_name: str, endpoint_suffix: str,
+                      secret: _FingerprintedSecret) -> AioBlobServiceClient:
+    """Build async Blob service client, cached per credential fingerprint"""
+    account_url = f"https://{account_name}.blob.{endpoint_suffix}"
+    
+    if auth_method == "account_key":
+        return AioBlobServiceClient(account_url=account_url, credential=secret.value)
+    elif auth_method == "sas_token":
+        sas_token = secret.value
+        if not sas_token.startswith('?'):
+            sas_token = '?' + sas_token
+        return AioBlobServiceClient(account_url=account_url + sas_token)
+    elif auth_method == "connection_string":
+        return AioBlobServiceClient.from_connection_string(secret.value)
+    elif auth_method == "oauth":
+        return AioBlobServiceClient(account_url=account_url, credential=AsyncSimpleTokenCredential(secret.value))
+    else:
+        raise ValueError(f"Unsupported authentication method: {auth_method}")
+
+
+def _iso(dt: Optional[datetime]) -> str:
+    """Format listing timestamps (empty string when missing)"""
+    return dt.isoformat() if dt else ""
+
+
+class _BlobSizeChanged(Exception):
+    """Raised before any data is yielded when the blob size differs from its (cached) properties"""
+    
+    def __init__(self, expected: int, actual: int):
+        super().__init__(f"Blob size changed: expected {expected}, got {actual}")
+        self.expected = expected
+        self.actual = actual
+
+
+def _content_range_total(content_range: Optional[str]) -> Optional[int]:
+    """Total blob size from a 'bytes <start>-<end>/<total>' Content-Range value"""
+    if not content_range or "/" not in content_range:
+        return None
+    total = content_range.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+def _hedged_call(fn, hedge_seconds: float) -> Any:
+    """Call fn, racing an identical backup call if the first has not finished after hedge_seconds"""
+    primary = _hedge_executor.submit(fn)
+    try:
+        return primary.result(timeout=hedge_seconds)
+    except FuturesTimeoutError:
+        pass
+    
+    logger.debug(f"[Azure Blob] Request slower than {hedge_seconds}s, sending hedged request")
+    backup = _hedge_executor.submit(fn)
+    futures = [primary, backup]
+    for future in as_completed(futures):
+        if future.exception() is None:
+            for other in futures:
+                if other is not future:
+                    other.cancel()
+            return future.result()
+    # Both attempts failed, surface the original error
+    return primary.result()
+
+
 class AzureBlobDataSource(OnlineDriveDatasource):
     
     def invoke(self, request: Any) -> Generator[DatasourceMessage, None, None]:
         """Only use OnlineDrive standard browse/download process."""
         yield from super().invoke(request)
 
-    def _get_blob_service_client(self) -> BlobServiceClient:
-        """Get Blob service client"""
-        if not hasattr(self, '_blob_service_client') or self._blob_service_client is None:
-            credentials = self.runtime.credentials
+    def _get_creds(self) -> types.SimpleNamespace:
+        """Snapshot of runtime credentials with defaults applied, parsed once per instance"""
+        if getattr(self, "_creds", None) is None:
+            credentials = self.runtime.credentials or {}
             auth_method = credentials.get("auth_method", "account_key")
             account_name = credentials.get("account_name")
             endpoint_suffix = credentials.get("endpoint_suffix", "core.windows.net")
+            secret_field = _SECRET_FIELDS.get(auth_method)
             
-            if auth_method == "account_key":
-                account_key = credentials.get("account_key")
-                account_url = f"https://{account_name}.blob.{endpoint_suffix}"
-                self._blob_service_client = BlobServiceClient(
-                    account_url=account_url, 
-                    credential=account_key
-                )
-                
-            elif auth_method == "sas_token":
-                sas_token = credentials.get("sas_token")
-                if not sas_token.startswith('?'):
-                    sas_token = '?' + sas_token
-                account_url = f"https://{account_name}.blob.{endpoint_suffix}"
-                self._blob_service_client = BlobServiceClient(
-                    account_url=account_url + sas_token
-                )
-                
-            elif auth_method == "connection_string":
-                connection_string = credentials.get("connection_string")
-                self._blob_service_client = BlobServiceClient.from_connection_string(
-                    connection_string
-                )
-                
-            elif auth_method == "oauth":
-                access_token = credentials.get("access_token")
-                account_url = f"https://{account_name}.blob.{endpoint_suffix}"
-                
-                # Create simple token credential
-                from azure.core.credentials import AccessToken
-                from datetime import datetime, timezone
-                
-                class SimpleTokenCredential:
-                    def __init__(self, token, expires_in=3600):
-                        self.token = token
-                        self.expires_at = int(datetime.now(timezone.utc).timestamp()) + expires_in
-                    
-                    def get_token(self, *scopes, **kwargs):
-                        current_time = int(datetime.now(timezone.utc).timestamp())
-                        if current_time >= self.expires_at - 300:  # Refresh 5 minutes early
-                            from azure.core.exceptions import ClientAuthenticationError
-                            raise ClientAuthenticationError("Access token has expired, refresh required")
-                        return AccessToken(self.token, self.expires_at)
-                
-                credential = SimpleTokenCredential(access_token)
-                self._blob_service_client = BlobServiceClient(
-                    account_url=account_url, 
-                    credential=credential
-                )
-                
-            else:
-                raise ValueError(f"Unsupported authentication method: {auth_method}")
+            # Number of parallel connections for downloads (credential override supported)
+            try:
+                max_concurrency = int(credentials.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)
+            except (TypeError, ValueError):
+                max_concurrency = DEFAULT_MAX_CONCURRENCY
+            # Delay before a hedged listing request is sent (0 disables hedging)
+            try:
+                hedge_ms = float(credentials.get("hedge_ms") or 0)
+            except (TypeError, ValueError):
+                hedge_ms = 0
+            
+            self._creds = types.SimpleNamespace(
+                auth_method=auth_method,
+                account_name=account_name,
+                endpoint_suffix=endpoint_suffix,
+                secret=_FingerprintedSecret(credentials.get(secret_field) or "") if secret_field else None,
+                sas_token=credentials.get("sas_token") or "",
+                max_concurrency=max(1, max_concurrency),
+                hedge_seconds=max(0.0, hedge_ms / 1000),
+                download_engine=credentials.get("download_engine", "sync"),
+            )
+            self._account_url = f"https://{account_name}.blob.{endpoint_suffix}"
+        return self._creds
+
+    def _get_max_concurrency(self) -> int:
+        """Get number of parallel connections for downloads (credential override supported)"""
+        return self._get_creds().max_concurrency
+
+    def _get_hedge_seconds(self) -> float:
+        """Get delay before a hedged listing request is sent (0 disables hedging)"""
+        return self._get_creds().hedge_seconds
+
+    def _use_async_download(self) -> bool:
+        """Whether SDK downloads should go through the shared async client"""
+        return self._get_creds().download_engine == "async"
+
+    def _get_aio_blob_service_client(self) -> AioBlobServiceClient:
+        """Get async Blob service client (shared across invocations)"""
+        creds = self._get_creds()
+        if creds.secret is None:
+            raise ValueError(f"Unsupported authentication method: {creds.auth_method}")
+        return _build_aio_client(creds.auth_method, creds.account_name, creds.endpoint_suffix, creds.secret)
+
+    def _get_blob_service_client(self) -> BlobServiceClient:
+        """Get Blob service client"""
+        if not hasattr(self, '_blob_service_client') or self._blob_service_client is None:
+            creds = self._get_creds()
+            if creds.secret is None:
+                raise ValueError(f"Unsupported authentication method: {creds.auth_method}")
+            
+            # Shared across invocations so the HTTP connection pool is reused
+            self._blob_service_client = _build_client(
+                creds.auth_method,
+                creds.account_name,
+                creds.endpoint_suffix,
+                creds.secret,
+                creds.max_concurrency,
+            )
+            # Scope cached metadata to this storage account and credential
+            self._cache_namespace = (
+                f"{creds.auth_method}:{creds.account_name}:{creds.endpoint_suffix}:{creds.secret.fingerprint}"
+            )
                 
         return self._blob_service_client
     
+    def _cached_props(self, key: str, fetch, ttl: float = META_CACHE_TTL,
+                      negative_ttl: Optional[float] = None) -> Any:
+        """Return cached properties for key, calling fetch() on miss or expiry (None results use negative_ttl)"""
+        cache_key = (getattr(self, "_cache_namespace", ""), key)
+        with _meta_cache_lock:
+            entry = _meta_cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        value = fetch()
+        if value is None and negative_ttl is not None:
+            self._seed_props(key, value, negative_ttl)
+        else:
+            self._seed_props(key, value, ttl)
+        return value
+    
+    def _seed_props(self, key: str, value: Any, ttl: float = META_CACHE_TTL) -> None:
+        """Store properties for key (e.g. from listing results)"""
+        cache_key = (getattr(self, "_cache_namespace", ""), key)
+        now = time.monotonic()
+        with _meta_cache_lock:
+            # Kept in insertion order, so evicting the oldest entry is O(1)
+            _meta_cache[cache_key] = (now + ttl, value)
+            _meta_cache.move_to_end(cache_key)
+            while len(_meta_cache) > META_CACHE_MAX_ENTRIES:
+                _meta_cache.popitem(last=False)
+    
+    def _invalidate(self, key: str) -> None:
+        """Drop cached properties for key (call after mutating the blob or container)"""
+        cache_key = (getattr(self, "_cache_namespace", ""), key)
+        with _meta_cache_lock:
+            _meta_cache.pop(cache_key, None)
+    
     def _browse_files(self, request: OnlineDriveBrowseFilesRequest) -> OnlineDriveBrowseFilesResponse:
         """Browse Azure Blob Storage files"""
         bucket_name = request.bucket  # Container name
@@ -107,19 +419,18 @@ class AzureBlobDataSource(OnlineDriveDatasource):
                 potential_container = prefix_parts[0]
                 remaining_prefix = '/'.join(prefix_parts[1:]) if len(prefix_parts) > 1 else ""
                 
-                # Try to verify if this is a valid container name
-                blob_service_client = self._get_blob_service_client()
-                try:
-                    container_client = blob_service_client.get_container_client(potential_container)
-                    # Simple check if container exists (no exception means container exists)
-                    container_client.get_container_properties()
-                    
-                    # Container exists, use parsed values
-                    bucket_name = potential_container
-                    prefix = remaining_prefix
-                except Exception:
-                    # Parsing failed, continue with original values
-                    pass
+                # Only probe names that satisfy Azure container naming rules
+                if (_CONTAINER_NAME_RE.fullmatch(potential_container)
+                        or _RESERVED_CONTAINER_RE.fullmatch(potential_container)):
+                    blob_service_client = self._get_blob_service_client()
+                    try:
+                        if self._container_exists(blob_service_client, potential_container):
+                            # Container exists, use parsed values
+                            bucket_name = potential_container
+                            prefix = remaining_prefix
+                    except Exception:
+                        # Parsing failed, continue with original values
+                        pass
         
         try:
             blob_service_client = self._get_blob_service_client()
@@ -143,59 +454,109 @@ class AzureBlobDataSource(OnlineDriveDatasource):
         except Exception as e:
             raise ValueError(f"Failed to browse Azure Blob Storage: {str(e)}")
     
+    def _get_page(self, scope: tuple, token: Optional[str], fetch_page) -> tuple[List[Any], Optional[str]]:
+        """Return (items, next_token) for a listing page, using a prefetched result when available"""
+        cache_key = (getattr(self, "_cache_namespace", ""), scope, token)
+        with _page_cache_lock:
+            entry = _page_cache.pop(cache_key, None)
+        if entry is not None and entry[0] > time.monotonic():
+            try:
+                return entry[1].result(timeout=PREFETCH_WAIT_TIMEOUT)
+            except Exception as e:
+                # Prefetch failed or is too slow, fetch directly
+                logger.debug(f"[Azure Blob] Prefetched page unavailable: {str(e)}")
+        return fetch_page(token)
+    
+    def _prefetch_page(self, scope: tuple, token: str, fetch_page) -> None:
+        """Start fetching the page for token in the background"""
+        self._store_page(scope, token, lambda: _prefetch_executor.submit(fetch_page, token))
+    
+    def _stash_page(self, scope: tuple, token: Optional[str], result: tuple[List[Any], Optional[str]]) -> None:
+        """Keep an already fetched page for a call resuming inside it"""
+        def completed():
+            future = Future()
+            future.set_result(result)
+            return future
+        self._store_page(scope, token, completed)
+    
+    def _store_page(self, scope: tuple, token: Optional[str], make_future) -> None:
+        """Register the future from make_future() for (scope, token) unless one is already pending"""
+        cache_key = (getattr(self, "_cache_namespace", ""), scope, token)
+        now = time.monotonic()
+        with _page_cache_lock:
+            # Sweep first, so an expired entry for this key is replaced rather than kept
+            for stale_key in [k for k, (expires_at, _) in _page_cache.items() if expires_at <= now]:
+                del _page_cache[stale_key]
+            if cache_key in _page_cache:
+                return
+            if len(_page_cache) >= PREFETCH_MAX_PAGES:
+                _page_cache.pop(next(iter(_page_cache)))[1].cancel()
+            _page_cache[cache_key] = (now + PREFETCH_TTL, make_future())
+    
+    def _container_exists(self, blob_service_client: BlobServiceClient, container_name: str) -> bool:
+        """Check container existence, caching hits for 5 minutes and misses for 1 minute"""
+        def probe():
+            try:
+                return blob_service_client.get_container_client(container_name).get_container_properties()
+            except ResourceNotFoundError:
+                return None
+        
+        container_properties = self._cached_props(
+            f"ctr:{container_name}", probe,
+            ttl=CONTAINER_EXISTS_TTL, negative_ttl=CONTAINER_MISSING_TTL
+        )
+        return container_properties is not None
+    
     def _list_containers(self, blob_service_client: BlobServiceClient, max_keys: int, 
                         next_page_parameters: Dict) -> OnlineDriveBrowseFilesResponse:
         """List all containers"""
         continuation_token = next_page_parameters.get("continuation_token")
         
-        # According to Azure Blob SDK documentation, list_containers doesn't support results_per_page parameter
-        # Use pagination iterator to control page size
-        if continuation_token:
-            containers_page = blob_service_client.list_containers().by_page(
-                continuation_token=continuation_token
-            )
-        else:
-            containers_page = blob_service_client.list_containers().by_page()
+        hedge_seconds = self._get_hedge_seconds()
+        
+        def fetch_page(token):
+            def fetch():
+                # Request only max_keys containers per page from the service
+                # Listing already returns public access / immutability / legal hold, include metadata inline
+                # so no per-container get_container_properties() round trip is needed
+                containers_page = blob_service_client.list_containers(
+                    include_metadata=True, results_per_page=max_keys
+                ).by_page(continuation_token=token)
+                containers = list(next(containers_page))
+                # Token is exposed by the page iterator after fetching
+                return containers, getattr(containers_page, 'continuation_token', None)
+            
+            if hedge_seconds > 0:
+                return _hedged_call(fetch, hedge_seconds)
+            return fetch()
         
-        page = next(containers_page)
+        page_scope = ("containers", max_keys)
+        page, new_continuation_token = self._get_page(page_scope, continuation_token, fetch_page)
+        if new_continuation_token:
+            self._prefetch_page(page_scope, new_continuation_token, fetch_page)
         
         files = []
         for container in page:
-            # Get container properties
-            try:
-                container_client = blob_service_client.get_container_client(container.name)
-                container_properties = container_client.get_container_properties()
-                
-                files.append(OnlineDriveFile(
-                    id=container.name,
-                    name=container.name,
-                    size=0,  # Container itself has no size
-                    type="folder",
-                    metadata={
-                        "container_name": container.name,
-                        "last_modified": container.last_modified.isoformat() if container.last_modified else "",
-                        "etag": container.etag or "",
-                        "public_access": getattr(container_properties, "public_access", "none"),
-                        "has_immutability_policy": getattr(container_properties, "has_immutability_policy", False),
-                        "has_legal_hold": getattr(container_properties, "has_legal_hold", False)
-                    }
-                ))
-            except Exception:
-                # If unable to get container properties, use basic info
-                files.append(OnlineDriveFile(
-                    id=container.name,
-                    name=container.name,
-                    size=0,
-                    type="folder",
-                    metadata={
-                        "container_name": container.name,
-                        "last_modified": container.last_modified.isoformat() if container.last_modified else "",
-                        "etag": container.etag or ""
-                    }
-                ))
+            # Later container probes can reuse the listed properties
+            self._seed_props(f"ctr:{container.name}", container)
+            
+            files.append(OnlineDriveFile(
+                id=container.name,
+                name=container.name,
+                size=0,  # Container itself has no size
+                type="folder",
+                metadata={
+                    "container_name": container.name,
+                    "last_modified": _iso(container.last_modified),
+                    "etag": container.etag or "",
+                    "public_access": getattr(container, "public_access", None) or "none",
+                    "has_immutability_policy": getattr(container, "has_immutability_policy", False),
+                    "has_legal_hold": getattr(container, "has_legal_hold", False),
+                    "metadata": getattr(container, "metadata", None) or {},
+                }
+            ))
         
         # Check if there are more pages
-        new_continuation_token = getattr(page, 'continuation_token', None)
         is_truncated = new_continuation_token is not None
         next_page_params = {"continuation_token": new_continuation_token} if is_truncated else {}
         
@@ -212,44 +573,74 @@ class AzureBlobDataSource(OnlineDriveDatasource):
                                prefix: str, max_keys: int, next_page_parameters: Dict) -> OnlineDriveBrowseFilesResponse:
         """List blobs in container"""
         continuation_token = next_page_parameters.get("continuation_token")
+        # Items of the page already returned by a previous call that stopped at max_keys
+        # (only happens when the service ignores results_per_page, see the loop below)
+        try:
+            offset = max(0, int(next_page_parameters.get("offset") or 0))
+        except (TypeError, ValueError):
+            offset = 0
         
         try:
             container_client = blob_service_client.get_container_client(container_name)
-            items_iter = container_client.walk_blobs(
-                name_starts_with=prefix if prefix else None
-            )
+            
+            def fetch_page(token):
+                items_iter = container_client.walk_blobs(
+                    name_starts_with=prefix if prefix else None,
+                    results_per_page=max_keys
+                )
+                # Pagination
+                items_page_iter = items_iter.by_page(continuation_token=token)
+                items = list(next(items_page_iter))
+                # Token is exposed by the page iterator after fetching
+                return items, getattr(items_page_iter, 'continuation_token', None)
 
-            # Pagination
-            items_page_iter = items_iter.by_page(continuation_token) if continuation_token else items_iter.by_page()
-            page = next(items_page_iter)
+            page_scope = ("blobs", container_name, prefix, max_keys)
+            page, new_continuation_token = self._get_page(page_scope, continuation_token, fetch_page)
+            if new_continuation_token:
+                self._prefetch_page(page_scope, new_continuation_token, fetch_page)
 
             files = []
             seen_dirs = set()
 
+            # Local aliases for the per-item hot loop
+            append_file = files.append
+            file_cls = OnlineDriveFile
+            get_content_type = self._get_content_type
+            seed_props = self._seed_props
+            intern = sys.intern
+            plen = len(prefix)
+
+            stopped_at = None
+
             # BlobPrefix represents directory, BlobProperties represents file
-            for item in page:
-                item_name = getattr(item, "name", None)
+            for index in range(offset, len(page)):
+                if len(files) >= max_keys:
+                    # Guard only: pages are requested with results_per_page=max_keys, so this
+                    # fires just if the service returns an oversized page; resume from here next call
+                    stopped_at = index
+                    break
+                item = page[index]
+                item_name = item.name
                 if not item_name:
                     continue
 
-                # Calculate relative name for display
-                display_name = item_name[len(prefix):] if prefix and item_name.startswith(prefix) else item_name
+                # Relative name starts after the prefix, scan for the next separator once
+                start = plen if item_name.startswith(prefix) else 0
+                sep = item_name.find("/", start)
 
                 # Fix folder judgment logic: only explicit directory markers are folders
-                is_folder = (item_name.endswith("/") and getattr(item, "size", 0) == 0) or type(item).__name__ == "BlobPrefix"
+                is_folder = isinstance(item, BlobPrefix) or (item_name.endswith("/") and item.size == 0)
                 
                 if is_folder:
                     # Directory: only show first-level directories in current layer
-                    first_dir = display_name.rstrip("/")
-                    if "/" in first_dir:
-                        first_dir = first_dir.split("/", 1)[0]
+                    first_dir = item_name[start:sep] if sep != -1 else item_name[start:]
                     
                     if first_dir and first_dir not in seen_dirs:
-                        seen_dirs.add(first_dir)
+                        seen_dirs.add(intern(first_dir))
                         dir_path = f"{prefix}{first_dir}/" if prefix else f"{first_dir}/"
                         # Construct correct directory ID format: container_name/dir_path
                         dir_id = f"{container_name}/{dir_path}"
-                        files.append(OnlineDriveFile(
+                        append_file(file_cls(
                             id=dir_id,  # Use container_name/dir_path format
                             name=first_dir,
                             size=0,
@@ -262,21 +653,31 @@ class AzureBlobDataSource(OnlineDriveDatasource):
                         ))
                 else:
                     # File: only show current level (no further /)
-                    if "/" in display_name:
+                    if sep != -1:
                         # Deeper level files not shown in this layer, carried by directory items
                         continue
+                    display_name = item_name[start:]
                     
-                    content_type = self._get_content_type(item_name, getattr(item, "content_settings", None))
-                    size_val = getattr(item, "size", 0) or 0
-                    last_modified = getattr(item, "last_modified", None)
-                    etag = getattr(item, "etag", "") or ""
-                    creation_time = getattr(item, "creation_time", None)
-                    blob_tier = getattr(item, "blob_tier", "Unknown")
-                    metadata_val = getattr(item, "metadata", None) or {}
+                    # walk_blobs only yields BlobProperties here, so attributes are always present
+                    try:
+                        content_type = get_content_type(item_name, item.content_settings)
+                        size_val = item.size or 0
+                        last_modified = item.last_modified
+                        etag = item.etag or ""
+                        creation_time = item.creation_time
+                        blob_tier = item.blob_tier
+                        metadata_val = item.metadata or {}
+                        server_encrypted = item.server_encrypted
+                    except AttributeError:
+                        logger.warning(f"[Azure Blob] Skipping unexpected listing item: {item_name}")
+                        continue
 
+                    # Listing already carries size/tier/content settings, skip HEAD on download
+                    seed_props(f"{container_name}/{item_name}", item)
+                    
                     # Construct correct file ID format: container_name/blob_path
                     file_id = f"{container_name}/{item_name}"
-                    files.append(OnlineDriveFile(
+                    append_file(file_cls(
                         id=file_id,  # Use container_name/blob_path format
                         name=display_name,
                         size=size_val,
@@ -285,18 +686,23 @@ class AzureBlobDataSource(OnlineDriveDatasource):
                             "container_name": container_name,
                             "blob_path": item_name,
                             "content_type": content_type,
-                            "last_modified": last_modified.isoformat() if last_modified else "",
+                            "last_modified": _iso(last_modified),
                             "etag": etag,
                             "blob_tier": blob_tier,
-                            "creation_time": creation_time.isoformat() if creation_time else "",
-                            "server_encrypted": getattr(item, "server_encrypted", False),
+                            "creation_time": _iso(creation_time),
+                            "server_encrypted": server_encrypted,
                             "metadata": metadata_val,
                         }
                     ))
             # Check if there are more pages
-            new_continuation_token = getattr(page, 'continuation_token', None)
-            is_truncated = new_continuation_token is not None
-            next_page_params = {"continuation_token": new_continuation_token} if is_truncated else {}
+            if stopped_at is not None:
+                # Resume within the current page, keep it so the next call skips the fetch
+                self._stash_page(page_scope, continuation_token, (page, new_continuation_token))
+                is_truncated = True
+                next_page_params = {"continuation_token": continuation_token, "offset": stopped_at}
+            else:
+                is_truncated = new_continuation_token is not None
+                next_page_params = {"continuation_token": new_continuation_token} if is_truncated else {}
             
             return OnlineDriveBrowseFilesResponse(
                 result=[OnlineDriveFileBucket(
@@ -318,7 +724,18 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             return content_settings.content_type
         
         # Infer MIME type based on file extension
-        mime_type, _ = mimetypes.guess_type(blob_name)
+        dot = blob_name.rfind('.')
+        if dot < 0:
+            return "application/octet-stream"
+        raw_ext = blob_name[dot:]
+        ext = raw_ext.lower()
+        # Compressed/aliased suffixes (e.g. .tar.gz) need the full guess; like guess_type(),
+        # match the raw suffix too, since some are case-sensitive (.Z exists, .z does not)
+        if (raw_ext in mimetypes.encodings_map or ext in mimetypes.encodings_map
+                or raw_ext in mimetypes.suffix_map or ext in mimetypes.suffix_map):
+            mime_type, _ = mimetypes.guess_type(blob_name)
+        else:
+            mime_type = _EXT2MIME.get(ext)
         return mime_type or "application/octet-stream"
     
     def _download_file(self, request: OnlineDriveDownloadFileRequest) -> Generator[DatasourceMessage, None, None]:
@@ -341,7 +758,8 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             )
             
             # Get Blob properties
-            blob_properties = blob_client.get_blob_properties()
+            props_key = f"{container_name}/{blob_path}"
+            blob_properties = self._cached_props(props_key, blob_client.get_blob_properties)
             logger.info(f"[Azure Blob] Blob properties retrieved: size={blob_properties.size}, container={container_name}")
             
             # Check Blob tier, special handling needed for archive tier
@@ -358,20 +776,17 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             content_type = self._get_content_type(blob_path, blob_properties.content_settings)
             logger.info(f"[Azure Blob] Blob metadata: size={blob_size}, type={content_type}, tier={blob_tier}")
             
-            # Prefer SAS direct HTTP download (avoid SDK limitations)
-            credentials = self.runtime.credentials
-            auth_method = (credentials or {}).get("auth_method", "account_key")
-            if auth_method == "sas_token":
-                logger.info("[Azure Blob] Using SAS HTTP download path")
-                yield from self._download_via_sas_http(container_name, blob_path)
-            else:
-                # For large files, use streaming download (SDK)
-                if blob_size > 50 * 1024 * 1024:  # 50MB
-                    logger.info(f"[Azure Blob] Using large file download for {blob_size} bytes")
-                    yield from self._download_large_blob(blob_client, blob_path, content_type, blob_size)
-                else:
-                    logger.info(f"[Azure Blob] Using small file download for {blob_size} bytes")
-                    yield from self._download_small_blob(blob_client, blob_path, content_type, blob_size)
+            try:
+                yield from self._download_blob_content(blob_client, container_name, blob_path,
+                                                       content_type, blob_size)
+            except _BlobSizeChanged as e:
+                # Cached size was stale (blob overwritten), refetch properties and retry once
+                logger.warning(f"[Azure Blob] {e} for {file_id}, refreshing properties")
+                self._invalidate(props_key)
+                blob_properties = self._cached_props(props_key, blob_client.get_blob_properties)
+                content_type = self._get_content_type(blob_path, blob_properties.content_settings)
+                yield from self._download_blob_content(blob_client, container_name, blob_path,
+                                                       content_type, blob_properties.size)
                 
             logger.info(f"[Azure Blob] Download process completed successfully for: {file_id}")
                 
@@ -385,68 +800,218 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             logger.error(f"[Azure Blob] Unexpected error during download: {str(e)}")
             raise ValueError(f"Error downloading file: {str(e)}")
 
-    def _download_via_sas_http(self, container_name: str, blob_path: str) -> Generator[DatasourceMessage, None, None]:
-        """Download via HTTP using SAS URL (not dependent on SDK data stream)."""
-        credentials = self.runtime.credentials or {}
-        account = credentials.get("account_name")
-        suffix = credentials.get("endpoint_suffix", "core.windows.net")
-        sas = credentials.get("sas_token") or ""
-        if not account:
+    def _download_blob_content(self, blob_client, container_name: str, blob_path: str, content_type: str,
+                               blob_size: int) -> Generator[DatasourceMessage, None, None]:
+        """Pick the download path; raises _BlobSizeChanged before yielding if blob_size is stale"""
+        # Prefer SAS direct HTTP download (avoid SDK limitations)
+        if self._get_creds().auth_method == "sas_token":
+            logger.info("[Azure Blob] Using SAS HTTP download path")
+            yield from self._download_via_sas_http(container_name, blob_path, content_type, blob_size)
+        elif self._use_async_download():
+            logger.info(f"[Azure Blob] Using async SDK download for {blob_size} bytes")
+            yield from self._download_via_aio(container_name, blob_path, content_type, blob_size)
+        else:
+            # For large files, use streaming download (SDK)
+            if blob_size > 50 * 1024 * 1024:  # 50MB
+                logger.info(f"[Azure Blob] Using large file download for {blob_size} bytes")
+                yield from self._download_large_blob(blob_client, blob_path, content_type, blob_size)
+            else:
+                logger.info(f"[Azure Blob] Using small file download for {blob_size} bytes")
+                yield from self._download_small_blob(blob_client, blob_path, content_type, blob_size)
+    
+    def _download_via_sas_http(self, container_name: str, blob_path: str,
+                               content_type: str, blob_size: int) -> Generator[DatasourceMessage, None, None]:
+        """Download via HTTP using SAS URL (not dependent on SDK data stream).
+
+        Size and content type come from the blob properties already fetched by the caller.
+        """
+        creds = self._get_creds()
+        sas = creds.sas_token
+        if not creds.account_name:
             raise ValueError("account_name not configured")
         if not sas:
             raise ValueError("sas_token not configured for SAS HTTP download")
         if not sas.startswith("?"):
             sas = "?" + sas
-        url = f"https://{account}.blob.{suffix}/{container_name}/{blob_path}{sas}"
+        url = f"{self._account_url}/{container_name}/{blob_path}{sas}"
 
-        with requests.get(url, stream=True, timeout=60) as resp:
-            resp.raise_for_status()
-            content_type = resp.headers.get("Content-Type", "application/octet-stream")
-            file_name = os.path.basename(blob_path)
-            content_length_header = resp.headers.get("Content-Length")
-            try:
-                content_length = int(content_length_header) if content_length_header else 0
-            except Exception:
-                content_length = 0
+        file_name = os.path.basename(blob_path)
+        content_length = blob_size or 0
+
+        # Size unknown, fall back to a single streamed request
+        if content_length <= 0:
+            yield from self._download_via_sas_stream(url, file_name, content_type)
+            return
 
-            # Small files return at once
-            if 0 < content_length <= 50 * 1024 * 1024:
-                data = resp.content
+        # Small files return at once
+        if content_length <= SAS_SINGLE_GET_MAX_SIZE:
+            with _sas_http_client.stream("GET", url) as resp:
+                resp.raise_for_status()
+                # Check the live size before reading, the cached one may predate an overwrite
+                actual_size = int(resp.headers.get("Content-Length") or -1)
+                if actual_size >= 0 and actual_size != content_length:
+                    raise _BlobSizeChanged(content_length, actual_size)
+                data = resp.read()
+            yield self.create_blob_message(data, meta={
+                "file_name": file_name,
+                "mime_type": content_type,
+                "size": len(data),
+            })
+            return
+
+        # Large files: fetch ranges in parallel, return in ordered batches
+        part_size = max(1, SAS_BATCH_SIZE // SAS_MAX_WORKERS)
+        ranges = [
+            (i, min(i + part_size - 1, content_length - 1))
+            for i in range(0, content_length, part_size)
+        ]
+        parts_per_batch = SAS_MAX_WORKERS
+
+        with ThreadPoolExecutor(max_workers=SAS_MAX_WORKERS) as executor:
+            for batch_index in range(0, len(ranges), parts_per_batch):
+                batch = ranges[batch_index:batch_index + parts_per_batch]
+                # Only the first batch checks the total, so a stale size fails before anything is yielded
+                expected_total = content_length if batch_index == 0 else None
+                # Joined inside the helper, so the parts are released before the generator suspends
+                data = self._fetch_sas_batch(executor, url, batch, expected_total)
+
+                is_last = batch_index + parts_per_batch >= len(ranges)
                 yield self.create_blob_message(data, meta={
                     "file_name": file_name,
                     "mime_type": content_type,
-                    "size": len(data),
+                    "is_partial": not is_last,
                 })
-                return
+                data = None
+
+    def _fetch_sas_batch(self, executor: ThreadPoolExecutor, url: str, batch: List[tuple[int, int]],
+                         expected_total: Optional[int] = None) -> bytes:
+        """Fetch the ranges of one batch in parallel and join them in order."""
+        # Ordered slots joined once, avoids copying through an intermediate bytearray
+        slots: List[bytes] = [b""] * len(batch)
 
-            # Large files return in chunks
-            chunk_size = 8 * 1024 * 1024
-            buffer = bytearray()
-            for chunk in resp.iter_content(chunk_size=chunk_size):
+        first_slot = 0
+        if expected_total is not None:
+            # Fetch part 0 alone and check the total first, before parts past a shrunk blob's end get a 416
+            slots[0] = self._fetch_sas_range(url, *batch[0], expected_total=expected_total)
+            first_slot = 1
+        futures = {
+            executor.submit(self._fetch_sas_range, url, start, end): slot
+            for slot, (start, end) in enumerate(batch[first_slot:], first_slot)
+        }
+        for future in as_completed(futures):
+            slots[futures[future]] = future.result()
+        return b"".join(slots)
+
+    def _fetch_sas_range(self, url: str, start: int, end: int, expected_total: Optional[int] = None) -> bytes:
+        """Fetch a single byte range of a blob via SAS URL."""
+        resp = _sas_http_client.get(url, headers={"Range": f"bytes={start}-{end}"})
+        if expected_total is not None:
+            # Checked before the status: a 416 for an emptied blob still reports "bytes */<total>"
+            actual_total = _content_range_total(resp.headers.get("Content-Range"))
+            if actual_total is not None and actual_total != expected_total:
+                raise _BlobSizeChanged(expected_total, actual_total)
+        resp.raise_for_status()
+        data = resp.content
+        if len(data) != end - start + 1:
+            raise ValueError(f"Range {start}-{end} incomplete: expected {end - start + 1}, got {len(data)}")
+        return data
+
+    def _download_via_sas_stream(self, url: str, file_name: str,
+                                 content_type: str) -> Generator[DatasourceMessage, None, None]:
+        """Download via a single streamed SAS HTTP request (size unknown)."""
+        with _sas_http_client.stream("GET", url) as resp:
+            resp.raise_for_status()
+            content_type = resp.headers.get("Content-Type", content_type)
+
+            chunk_size = 1024 * 1024
+            pending: List[bytes] = []
+            pending_size = 0
+            for chunk in resp.iter_bytes(chunk_size=chunk_size):
                 if not chunk:
                     continue
-                buffer.extend(chunk)
-                if len(buffer) >= 100 * 1024 * 1024:  # 100MB batch output
-                    yield self.create_blob_message(bytes(buffer), meta={
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= SAS_BATCH_SIZE:
+                    # Drop the chunks before suspending, so only the joined batch stays resident
+                    data = b"".join(pending)
+                    pending = []
+                    pending_size = 0
+                    yield self.create_blob_message(data, meta={
                         "file_name": file_name,
                         "mime_type": content_type,
                         "is_partial": True,
                     })
-                    buffer = bytearray()
+                    data = None
 
-            if buffer:
-                yield self.create_blob_message(bytes(buffer), meta={
+            if pending:
+                yield self.create_blob_message(b"".join(pending), meta={
                     "file_name": file_name,
                     "mime_type": content_type,
                     "is_partial": False,
                 })
     
+    def _download_via_aio(self, container_name: str, blob_path: str, content_type: str,
+                          blob_size: int) -> Generator[DatasourceMessage, None, None]:
+        """Download through the shared async client in parallel ranged batches, fetched on demand"""
+        loop = _get_aio_loop()
+        aio_client = self._get_aio_blob_service_client()
+        blob_client = aio_client.get_blob_client(container=container_name, blob=blob_path)
+        max_concurrency = self._get_max_concurrency()
+        
+        async def fetch_batch(offset: int, length: int) -> bytes:
+            downloader = await blob_client.download_blob(
+                offset=offset, length=length, max_concurrency=max_concurrency
+            )
+            if offset == 0:
+                actual_size = _content_range_total(downloader.properties.content_range)
+                if actual_size is not None and actual_size != blob_size:
+                    raise _BlobSizeChanged(blob_size, actual_size)
+            # readinto() fetches the batch's sub-ranges over max_concurrency connections
+            buffer = io.BytesIO()
+            await downloader.readinto(buffer)
+            return buffer.getvalue()
+        
+        file_name = os.path.basename(blob_path)
+        total_downloaded = 0
+        for offset in range(0, blob_size, DOWNLOAD_BATCH_SIZE):
+            length = min(DOWNLOAD_BATCH_SIZE, blob_size - offset)
+            # One batch per request from the generator, so nothing is read ahead while
+            # the caller still holds the previous message (keeps memory at ~one batch)
+            content = asyncio.run_coroutine_threadsafe(fetch_batch(offset, length), loop).result()
+            total_downloaded += len(content)
+            if len(content) != length:
+                break
+            
+            is_last = offset + length >= blob_size
+            meta = {
+                "file_name": file_name,
+                "mime_type": content_type,
+                "size": len(content),
+                "is_partial": not is_last
+            }
+            if is_last:
+                logger.info(f"[Azure Blob] Async download completed: {total_downloaded} bytes")
+                meta["download_success"] = True
+            yield self.create_blob_message(blob=content, meta=meta)
+            # Release the batch before fetching the next one
+            content = None
+        
+        if total_downloaded != blob_size:
+            logger.error(f"[Azure Blob] Download incomplete: expected {blob_size}, got {total_downloaded}")
+            raise ValueError(f"Download incomplete: expected {blob_size}, got {total_downloaded}")
+        
+        if total_downloaded == 0:
+            raise ValueError(f"Downloaded content is empty for blob: {blob_path}")
+    
     def _download_small_blob(self, blob_client, blob_path: str, content_type: str, 
                            blob_size: int) -> Generator[DatasourceMessage, None, None]:
         """Download small file"""
         try:
             logger.info(f"[Azure Blob] Starting download of small file: {blob_path}")
             download_stream = blob_client.download_blob()
+            # The cached size chose this path; check the live one before reading it all into memory
+            if download_stream.size != blob_size:
+                raise _BlobSizeChanged(blob_size, download_stream.size)
             content = download_stream.readall()
             
             # Verify download success
@@ -475,6 +1040,8 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             )
             logger.info(f"[Azure Blob] Successfully yielded blob message for {file_name}")
             
+        except _BlobSizeChanged:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to download blob content: {str(e)}")
     
@@ -486,33 +1053,42 @@ class AzureBlobDataSource(OnlineDriveDatasource):
             # Extract file name
             file_name = os.path.basename(blob_path)
             
-            chunk_size = 8 * 1024 * 1024  # 8MB chunks
-            downloaded_content = bytearray()
+            max_concurrency = self._get_max_concurrency()
             total_downloaded = 0
             
-            # Download in chunks
-            for i in range(0, blob_size, chunk_size):
-                end_range = min(i + chunk_size - 1, blob_size - 1)
+            # Each batch is one ranged download_blob(); readinto() lets the SDK fetch
+            # its sub-ranges over max_concurrency connections at once
+            for offset in range(0, blob_size, DOWNLOAD_BATCH_SIZE):
+                length = min(DOWNLOAD_BATCH_SIZE, blob_size - offset)
+                logger.debug(f"[Azure Blob] Downloading range {offset}-{offset + length - 1} "
+                             f"with up to {max_concurrency} parallel connections")
+                download_stream = blob_client.download_blob(
+                    offset=offset, length=length, max_concurrency=max_concurrency
+                )
+                if offset == 0:
+                    actual_size = _content_range_total(download_stream.properties.content_range)
+                    if actual_size is not None and actual_size != blob_size:
+                        raise _BlobSizeChanged(blob_size, actual_size)
+                buffer = io.BytesIO()
+                download_stream.readinto(buffer)
+                content = buffer.getvalue()
+                total_downloaded += len(content)
                 
-                download_stream = blob_client.download_blob(offset=i, length=end_range - i + 1)
-                chunk = download_stream.readall()
-                downloaded_content.extend(chunk)
-                total_downloaded += len(chunk)
+                logger.debug(f"[Azure Blob] Downloaded {len(content)} bytes (total: {total_downloaded}/{blob_size})")
                 
-                logger.debug(f"[Azure Blob] Downloaded chunk {i//chunk_size + 1}: {len(chunk)} bytes (total: {total_downloaded}/{blob_size})")
+                if len(content) != length:
+                    break
                 
-                # If accumulated content is too large, can yield in batches
-                if len(downloaded_content) > 100 * 1024 * 1024:  # 100MB
-                    yield self.create_blob_message(
-                        blob=bytes(downloaded_content),
-                        meta={
-                            "file_name": file_name,
-                            "mime_type": content_type,
-                            "size": len(downloaded_content),
-                            "is_partial": True
-                        }
-                    )
-                    downloaded_content = bytearray()
+                is_last = offset + length >= blob_size
+                meta = {
+                    "file_name": file_name,
+                    "mime_type": content_type,
+                    "size": len(content),
+                    "is_partial": not is_last
+                }
+                if is_last:
+                    meta["download_success"] = True
+                yield self.create_blob_message(blob=content, meta=meta)
             
             # Verify download integrity
             if total_downloaded != blob_size:
@@ -520,19 +1096,8 @@ class AzureBlobDataSource(OnlineDriveDatasource):
                 raise ValueError(f"Download incomplete: expected {blob_size}, got {total_downloaded}")
             
             logger.info(f"[Azure Blob] Large file download completed: {total_downloaded} bytes")
-            
-            # Output remaining content
-            if downloaded_content:
-                yield self.create_blob_message(
-                    blob=bytes(downloaded_content),
-                    meta={
-                        "file_name": file_name,
-                        "mime_type": content_type,
-                        "size": len(downloaded_content),
-                        "download_success": True,
-                        "is_partial": False
-                    }
-                )
                 
+        except _BlobSizeChanged:
+            raise
         except Exception as e:
             raise ValueError(f"Failed to download large blob: {str(e)}")
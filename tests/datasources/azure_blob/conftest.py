@@ -0,0 +1,155 @@
+import importlib.util
+import io
+import os
+import threading
+import time
+import types
+
+import httpx
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+# Imported before the plugin module, as main.py does: dify_plugin applies gevent.monkey.patch_all(),
+# and the module's executors and locks must be created after patching
+import dify_plugin  # noqa: F401,E402
+
+PLUGIN_DIR = os.path.join('datasources', 'azure_blob')
+
+
+def load_module_from_path(module_name: str, file_path: str) -> types.ModuleType:
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    assert spec and spec.loader, f"cannot load spec for {module_name} from {file_path}"
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+@pytest.fixture(scope='session')
+def azure_blob():
+    return load_module_from_path(
+        'azure_blob_datasource', os.path.join(PLUGIN_DIR, 'datasources', 'azure_blob.py')
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_module_caches(azure_blob):
+    azure_blob._meta_cache.clear()
+    azure_blob._page_cache.clear()
+    yield
+    azure_blob._meta_cache.clear()
+    azure_blob._page_cache.clear()
+
+
+@pytest.fixture
+def make_datasource(azure_blob):
+    def make(**credentials):
+        runtime = types.SimpleNamespace(credentials={
+            'auth_method': 'account_key',
+            'account_name': 'testaccount',
+            'account_key': 'dGVzdA==',
+            **credentials,
+        })
+        return azure_blob.AzureBlobDataSource(runtime=runtime, session=None)
+    return make
+
+
+class RangeAdapter(BaseAdapter):
+    """requests adapter serving ranged blob GETs from memory and tracking concurrency"""
+
+    def __init__(self, data: bytes, delay: float = 0.02):
+        super().__init__()
+        self.data = data
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.ranges = []
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            header = request.headers.get('x-ms-range') or request.headers.get('Range')
+            start, end = header.split('=')[1].split('-')
+            start, end = int(start), min(int(end), len(self.data) - 1)
+            with self.lock:
+                self.ranges.append((start, end))
+            body = self.data[start:end + 1]
+
+            response = requests.Response()
+            response.status_code = 206
+            response.request = request
+            response.url = request.url
+            response._content = body
+            response.raw = io.BytesIO(body)
+            response.headers.update({
+                'Content-Range': f'bytes {start}-{end}/{len(self.data)}',
+                'Content-Length': str(len(body)),
+                'x-ms-blob-type': 'BlockBlob',
+                'ETag': '"0x1"',
+                'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT',
+                'x-ms-version': '2025-01-05',
+            })
+            return response
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def range_adapter():
+    return RangeAdapter
+
+
+class SasBlobHandler:
+    """httpx.MockTransport handler serving a blob over SAS URLs, ranged or whole"""
+
+    def __init__(self, data: bytes, delay: float = 0.02):
+        self.data = data
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.ranges = []
+        self.short_starts = set()  # range starts answered one byte short
+
+    def __call__(self, request):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            header = request.headers.get('Range')
+            with self.lock:
+                self.ranges.append(header)
+            if not header:
+                return httpx.Response(200, content=self.data)
+            start, end = (int(v) for v in header.split('=')[1].split('-'))
+            if start >= len(self.data):
+                return httpx.Response(416, headers={'Content-Range': f'bytes */{len(self.data)}'})
+            end = min(end, len(self.data) - 1)
+            body = self.data[start:end + 1]
+            if start in self.short_starts:
+                body = body[:-1]
+            return httpx.Response(206, content=body, headers={
+                'Content-Range': f'bytes {start}-{end}/{len(self.data)}',
+            })
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def sas_blob(azure_blob, monkeypatch):
+    """Route the shared SAS HTTP client to an in-memory blob, returns the handler"""
+    def serve(data: bytes, delay: float = 0.02):
+        handler = SasBlobHandler(data, delay)
+        monkeypatch.setattr(azure_blob, '_sas_http_client', httpx.Client(transport=httpx.MockTransport(handler)))
+        return handler
+    return serve
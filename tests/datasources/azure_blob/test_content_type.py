@@ -0,0 +1,28 @@
+import mimetypes
+
+import pytest
+
+
+@pytest.mark.parametrize('blob_name', [
+    'docs/report.pdf',
+    'docs/README.TXT',
+    'archive.tar.gz',
+    'archive.tgz',
+    'archive.GZ',
+    'a.tar.Z',
+    'font.pcf.Z',
+    'logo.svgz',
+    'data.tar.bz2',
+    'Makefile',
+    'dir.v2/noext',
+])
+def test_content_type_matches_guess_type(make_datasource, blob_name):
+    expected, _ = mimetypes.guess_type(blob_name)
+    assert make_datasource()._get_content_type(blob_name, None) == (expected or 'application/octet-stream')
+
+
+def test_content_settings_take_precedence(make_datasource):
+    class ContentSettings:
+        content_type = 'text/csv'
+
+    assert make_datasource()._get_content_type('data.bin', ContentSettings()) == 'text/csv'
@@ -0,0 +1,284 @@
+import asyncio
+import time
+import types
+
+import pytest
+import requests
+from aiohttp import web
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobClient
+from azure.storage.blob.aio import BlobClient as AioBlobClient
+from dify_plugin.entities.datasource import OnlineDriveDownloadFileRequest
+
+
+def make_blob_client(adapter):
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return BlobClient(
+        'https://testaccount.blob.core.windows.net', 'container', 'dir/file.bin',
+        transport=RequestsTransport(session=session),
+        max_single_get_size=64 * 1024,
+        max_chunk_get_size=64 * 1024,
+    )
+
+
+def test_large_blob_batches_download_ranges_in_parallel(azure_blob, make_datasource, range_adapter, monkeypatch):
+    monkeypatch.setattr(azure_blob, 'DOWNLOAD_BATCH_SIZE', 512 * 1024)
+    data = bytes(range(256)) * 4096 + b'tail'  # 1MB + 4 bytes -> 3 batches
+    adapter = range_adapter(data)
+    datasource = make_datasource(max_concurrency='8')
+
+    messages = list(datasource._download_large_blob(
+        make_blob_client(adapter), 'dir/file.bin', 'application/octet-stream', len(data)
+    ))
+
+    assert b''.join(m.message.blob for m in messages) == data
+    assert [m.meta['is_partial'] for m in messages] == [True, True, False]
+    assert messages[-1].meta['download_success'] is True
+    assert adapter.max_in_flight > 1
+
+
+def blob_props(size):
+    return types.SimpleNamespace(
+        size=size, blob_tier='Hot',
+        content_settings=types.SimpleNamespace(content_type='application/octet-stream'),
+    )
+
+
+def test_stale_cached_size_refetches_properties_once(azure_blob, make_datasource, range_adapter, monkeypatch):
+    monkeypatch.setattr(azure_blob, 'DOWNLOAD_BATCH_SIZE', 512 * 1024)
+    data = b'x' * (1024 * 1024)
+    blob_client = make_blob_client(range_adapter(data))
+    fetches = []
+    blob_client.get_blob_properties = lambda: fetches.append(1) or blob_props(len(data))
+    datasource = make_datasource()
+    monkeypatch.setattr(datasource, '_get_blob_service_client', lambda: types.SimpleNamespace(
+        get_blob_client=lambda container, blob: blob_client,
+    ))
+    # Cached before the blob was overwritten with a smaller one
+    datasource._seed_props('container/dir/file.bin', blob_props(64 * 1024 * 1024))
+
+    messages = list(datasource._download_file(OnlineDriveDownloadFileRequest(id='container/dir/file.bin')))
+
+    assert b''.join(m.message.blob for m in messages) == data
+    assert len(fetches) == 1
+
+
+@pytest.fixture
+def aio_range_server(azure_blob):
+    """Local HTTP server on the plugin's event loop serving ranged blob GETs"""
+    loop = azure_blob._get_aio_loop()
+    runners = []
+
+    def serve(data: bytes):
+        state = types.SimpleNamespace(data=data, in_flight=0, max_in_flight=0, port=None)
+
+        async def handler(request):
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                await asyncio.sleep(0.02)
+                start, end = request.headers['x-ms-range'].split('=')[1].split('-')
+                start, end = int(start), min(int(end), len(data) - 1)
+                return web.Response(status=206, body=data[start:end + 1], headers={
+                    'Content-Range': f'bytes {start}-{end}/{len(data)}',
+                    'x-ms-blob-type': 'BlockBlob',
+                    'ETag': '"0x1"',
+                    'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT',
+                    'x-ms-version': '2025-01-05',
+                })
+            finally:
+                state.in_flight -= 1
+
+        async def start():
+            app = web.Application()
+            app.router.add_get('/{tail:.*}', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            runners.append(runner)
+            return site._server.sockets[0].getsockname()[1]
+
+        state.port = asyncio.run_coroutine_threadsafe(start(), loop).result(timeout=10)
+        return state
+
+    yield serve
+    for runner in runners:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result(timeout=10)
+
+
+def test_async_download_batches_ranges_in_parallel(azure_blob, make_datasource, aio_range_server, monkeypatch):
+    monkeypatch.setattr(azure_blob, 'DOWNLOAD_BATCH_SIZE', 512 * 1024)
+    data = bytes(range(256)) * 4096 + b'tail'
+    server = aio_range_server(data)
+    client = AioBlobClient(
+        f'http://127.0.0.1:{server.port}/testaccount', 'container', 'dir/file.bin',
+        max_single_get_size=64 * 1024,
+        max_chunk_get_size=64 * 1024,
+    )
+    datasource = make_datasource(max_concurrency='8', download_engine='async')
+    monkeypatch.setattr(datasource, '_get_aio_blob_service_client', lambda: types.SimpleNamespace(
+        get_blob_client=lambda container, blob: client,
+    ))
+
+    try:
+        messages = list(datasource._download_via_aio('container', 'dir/file.bin', 'application/octet-stream', len(data)))
+    finally:
+        asyncio.run_coroutine_threadsafe(client.close(), azure_blob._get_aio_loop()).result(timeout=10)
+
+    assert b''.join(m.message.blob for m in messages) == data
+    assert [m.meta['is_partial'] for m in messages] == [True, True, False]
+    assert messages[-1].meta['download_success'] is True
+    assert server.max_in_flight > 1
+
+
+class CountingAioBlobClient:
+    """Async blob client stub recording every ranged download"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.fetched = []
+
+    async def download_blob(self, offset, length, max_concurrency=1):
+        self.fetched.append(offset)
+        body = self.data[offset:offset + length]
+        content_range = f'bytes {offset}-{offset + len(body) - 1}/{len(self.data)}'
+
+        async def readinto(stream):
+            stream.write(body)
+            return len(body)
+        return types.SimpleNamespace(
+            properties=types.SimpleNamespace(content_range=content_range), readinto=readinto,
+        )
+
+
+def test_async_download_fetches_one_batch_per_message(azure_blob, make_datasource, monkeypatch):
+    monkeypatch.setattr(azure_blob, 'DOWNLOAD_BATCH_SIZE', 1024)
+    data = b'x' * 4096
+    blob_client = CountingAioBlobClient(data)
+    datasource = make_datasource(download_engine='async')
+    monkeypatch.setattr(datasource, '_get_aio_blob_service_client', lambda: types.SimpleNamespace(
+        get_blob_client=lambda container, blob: blob_client,
+    ))
+
+    messages = datasource._download_via_aio('container', 'dir/file.bin', 'application/octet-stream', len(data))
+    first = next(messages)
+    # Caller still holds the first batch, nothing may be read ahead of it
+    time.sleep(0.1)
+    assert blob_client.fetched == [0]
+
+    rest = list(messages)
+    assert b''.join(m.message.blob for m in [first, *rest]) == data
+    assert blob_client.fetched == [0, 1024, 2048, 3072]
+
+
+def test_aio_loop_is_a_greenlet_on_the_main_thread(azure_blob):
+    import dify_plugin  # noqa: F401  # patches threading on import, as under main.py
+    from gevent import monkey
+
+    native_ident = monkey.get_original('_thread', 'get_ident')
+
+    async def loop_ident():
+        return native_ident()
+
+    assert monkey.is_module_patched('threading')
+    loop = azure_blob._get_aio_loop()
+    assert asyncio.run_coroutine_threadsafe(loop_ident(), loop).result(timeout=5) == native_ident()
+
+    coro = loop_ident()
+    with pytest.raises(RuntimeError, match='running event loop'):
+        asyncio.run(coro)
+    coro.close()
+
+
+def make_sas_datasource(make_datasource):
+    return make_datasource(auth_method='sas_token', sas_token='sv=2024&sig=x')
+
+
+def test_sas_ranged_stale_size_fails_before_any_parallel_range(azure_blob, make_datasource, sas_blob):
+    handler = sas_blob(b'x' * 1024 * 1024)
+    datasource = make_sas_datasource(make_datasource)
+
+    with pytest.raises(azure_blob._BlobSizeChanged):
+        next(datasource._download_via_sas_http('container', 'dir/file.bin', 'application/octet-stream',
+                                               200 * 1024 * 1024))
+    # Only part 0 was requested; parts past the new end would have been 416s
+    assert len(handler.ranges) == 1
+
+
+def test_sas_stale_size_refetches_properties_once(azure_blob, make_datasource, sas_blob, monkeypatch):
+    data = b'y' * 1024 * 1024
+    sas_blob(data)
+    fetches = []
+    blob_client = types.SimpleNamespace(get_blob_properties=lambda: fetches.append(1) or blob_props(len(data)))
+    datasource = make_sas_datasource(make_datasource)
+    monkeypatch.setattr(datasource, '_get_blob_service_client', lambda: types.SimpleNamespace(
+        get_blob_client=lambda container, blob: blob_client,
+    ))
+    datasource._seed_props('container/dir/file.bin', blob_props(200 * 1024 * 1024))
+
+    messages = list(datasource._download_file(OnlineDriveDownloadFileRequest(id='container/dir/file.bin')))
+
+    assert b''.join(m.message.blob for m in messages) == data
+    assert len(fetches) == 1
+
+
+def test_sas_small_path_checks_live_size(azure_blob, make_datasource, sas_blob):
+    sas_blob(b'z' * 4096)
+    datasource = make_sas_datasource(make_datasource)
+
+    with pytest.raises(azure_blob._BlobSizeChanged):
+        next(datasource._download_via_sas_http('container', 'dir/file.bin', 'application/octet-stream', 1024))
+
+
+def test_small_blob_checks_live_size(azure_blob, make_datasource, range_adapter):
+    datasource = make_datasource()
+    blob_client = make_blob_client(range_adapter(b'z' * 4096))
+
+    with pytest.raises(azure_blob._BlobSizeChanged):
+        next(datasource._download_small_blob(blob_client, 'dir/file.bin', 'application/octet-stream', 1024))
+
+
+@pytest.fixture
+def small_sas_batches(azure_blob, monkeypatch):
+    # 64KB single-GET limit, 256KB batches of 4 x 64KB ranged GETs
+    monkeypatch.setattr(azure_blob, 'SAS_SINGLE_GET_MAX_SIZE', 64 * 1024)
+    monkeypatch.setattr(azure_blob, 'SAS_BATCH_SIZE', 256 * 1024)
+    monkeypatch.setattr(azure_blob, 'SAS_MAX_WORKERS', 4)
+
+
+def test_sas_ranged_download_reassembles_batches_in_order(make_datasource, sas_blob, small_sas_batches):
+    data = bytes(range(256)) * 4096 + b'tail'  # 1MB + 4 bytes -> 17 parts, 5 batches
+    handler = sas_blob(data)
+    datasource = make_sas_datasource(make_datasource)
+
+    messages = list(datasource._download_via_sas_http('container', 'dir/file.bin', 'application/octet-stream',
+                                                      len(data)))
+
+    assert b''.join(m.message.blob for m in messages) == data
+    assert [m.meta['is_partial'] for m in messages] == [True, True, True, True, False]
+    assert len(handler.ranges) == 17
+    assert handler.max_in_flight > 1
+
+
+def test_sas_single_get_at_or_below_threshold(make_datasource, sas_blob, small_sas_batches):
+    data = b'a' * 64 * 1024
+    handler = sas_blob(data)
+    datasource = make_sas_datasource(make_datasource)
+
+    messages = list(datasource._download_via_sas_http('container', 'dir/file.bin', 'application/octet-stream',
+                                                      len(data)))
+
+    assert [m.message.blob for m in messages] == [data]
+    assert handler.ranges == [None]
+
+
+def test_sas_ranged_download_rejects_short_range(make_datasource, sas_blob, small_sas_batches):
+    data = b'b' * 512 * 1024
+    handler = sas_blob(data)
+    handler.short_starts.add(128 * 1024)
+    datasource = make_sas_datasource(make_datasource)
+
+    with pytest.raises(ValueError, match='incomplete'):
+        list(datasource._download_via_sas_http('container', 'dir/file.bin', 'application/octet-stream', len(data)))
@@ -0,0 +1,51 @@
+import itertools
+import time
+
+import pytest
+
+
+def attempts(*behaviours):
+    """fn whose n-th call sleeps, then returns or raises per behaviours[n]"""
+    counter = itertools.count()
+    calls = []
+
+    def fn():
+        index = next(counter)
+        calls.append(index)
+        delay, outcome = behaviours[index]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return fn, calls
+
+
+def test_primary_before_hedge_delay_sends_no_backup(azure_blob):
+    fn, calls = attempts((0, 'primary'))
+
+    assert azure_blob._hedged_call(fn, 0.5) == 'primary'
+    assert calls == [0]
+
+
+def test_slow_primary_loses_to_backup(azure_blob):
+    fn, calls = attempts((1.0, 'primary'), (0, 'backup'))
+
+    started = time.monotonic()
+    assert azure_blob._hedged_call(fn, 0.05) == 'backup'
+    assert time.monotonic() - started < 0.5
+    assert calls == [0, 1]
+
+
+def test_failed_primary_falls_back_to_backup(azure_blob):
+    fn, calls = attempts((0.1, ValueError('primary')), (0.2, 'backup'))
+
+    assert azure_blob._hedged_call(fn, 0.05) == 'backup'
+    assert calls == [0, 1]
+
+
+def test_both_failing_raises_primary_error(azure_blob):
+    fn, calls = attempts((0.1, ValueError('primary')), (0, ValueError('backup')))
+
+    with pytest.raises(ValueError, match='primary'):
+        azure_blob._hedged_call(fn, 0.05)
+    assert calls == [0, 1]
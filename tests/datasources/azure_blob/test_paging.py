@@ -0,0 +1,199 @@
+import collections
+import time
+import types
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from dify_plugin.entities.datasource import OnlineDriveBrowseFilesRequest
+
+
+def blob(name):
+    return types.SimpleNamespace(
+        name=name, size=1, content_settings=None, last_modified=None, etag='"1"',
+        creation_time=None, blob_tier='Hot', metadata={}, server_encrypted=True,
+    )
+
+
+class FakePager:
+    """Page iterator as returned by ItemPaged.by_page(): the token lives here, not on the pages"""
+
+    def __init__(self, pages, token, fetches):
+        self._pages = pages
+        self._token = token
+        self._fetches = fetches
+        self.continuation_token = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._fetches[self._token] += 1
+        items, self.continuation_token = self._pages[self._token]
+        # Plain iterator, has no continuation_token attribute of its own
+        return iter(items)
+
+
+class FakeItemPaged:
+    def __init__(self, pages, fetches):
+        self._pages = pages
+        self._fetches = fetches
+
+    def by_page(self, continuation_token=None):
+        return FakePager(self._pages, continuation_token, self._fetches)
+
+
+class FakeServiceClient:
+    """Serves pages keyed by continuation token and counts fetches per token.
+
+    Pages are returned as given, even when larger than the requested results_per_page,
+    which stands in for a service page that ignores the limit.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetches = collections.Counter()
+        self.results_per_page = []
+
+    def get_container_client(self, container_name):
+        def walk_blobs(name_starts_with=None, results_per_page=None):
+            self.results_per_page.append(results_per_page)
+            return FakeItemPaged(self.pages, self.fetches)
+        return types.SimpleNamespace(walk_blobs=walk_blobs)
+
+    def list_containers(self, include_metadata=False, results_per_page=None):
+        self.results_per_page.append(results_per_page)
+        return FakeItemPaged(self.pages, self.fetches)
+
+
+@pytest.fixture
+def browse(make_datasource, monkeypatch):
+    def make(pages):
+        service = FakeServiceClient(pages)
+        datasource = make_datasource()
+        monkeypatch.setattr(datasource, '_get_blob_service_client', lambda: service)
+
+        def call(max_keys, next_page_parameters=None, bucket='container'):
+            response = datasource._browse_files(OnlineDriveBrowseFilesRequest(
+                bucket=bucket, prefix='', max_keys=max_keys, next_page_parameters=next_page_parameters,
+            ))
+            return response.result[0]
+        return service, call
+    return make
+
+
+def names(bucket):
+    return [f.name for f in bucket.files]
+
+
+def wait_for_prefetches(azure_blob):
+    for _, future in list(azure_blob._page_cache.values()):
+        future.result(timeout=5)
+
+
+def test_page_within_max_keys_has_no_offset(browse):
+    service, call = browse({None: ([blob(n) for n in 'ab'], '2'), '2': ([blob('c')], None)})
+
+    first = call(2)
+
+    assert set(service.results_per_page) == {2}
+    assert names(first) == ['a', 'b']
+    assert first.next_page_parameters == {'continuation_token': '2'}
+
+
+def test_oversized_service_page_resumes_by_offset(browse):
+    # Service returned 5 items although only 2 were requested
+    service, call = browse({None: ([blob(n) for n in 'abcde'], '2'), '2': ([blob('f')], None)})
+
+    first = call(2)
+    assert set(service.results_per_page) == {2}
+    assert names(first) == ['a', 'b']
+    assert first.is_truncated
+    assert first.next_page_parameters == {'continuation_token': None, 'offset': 2}
+
+    second = call(2, first.next_page_parameters)
+    assert names(second) == ['c', 'd']
+    assert second.next_page_parameters == {'continuation_token': None, 'offset': 4}
+
+    third = call(2, second.next_page_parameters)
+    assert names(third) == ['e']
+    # Token read from the pager once the page is exhausted
+    assert third.next_page_parameters == {'continuation_token': '2'}
+    assert service.fetches[None] == 1
+
+
+@pytest.mark.parametrize('drop', ['expire', 'evict'])
+def test_oversized_page_refetches_when_stash_is_gone(azure_blob, browse, drop):
+    service, call = browse({None: ([blob(n) for n in 'abcd'], None)})
+
+    first = call(2)
+    if drop == 'expire':
+        for key, (_, future) in list(azure_blob._page_cache.items()):
+            azure_blob._page_cache[key] = (0, future)
+    else:
+        azure_blob._page_cache.clear()
+
+    second = call(2, first.next_page_parameters)
+    assert names(second) == ['c', 'd']
+    assert not second.is_truncated
+    assert service.fetches[None] == 2
+
+
+def test_prefetched_next_page_is_reused(azure_blob, browse):
+    service, call = browse({None: ([blob('a')], '1'), '1': ([blob('b')], None)})
+
+    first = call(10)
+    wait_for_prefetches(azure_blob)
+    second = call(10, first.next_page_parameters)
+
+    assert names(second) == ['b']
+    assert service.fetches['1'] == 1
+
+
+def test_prefetch_miss_fetches_directly(azure_blob, browse):
+    service, call = browse({None: ([blob('a')], '1'), '1': ([blob('b')], None)})
+
+    first = call(10)
+    wait_for_prefetches(azure_blob)
+    azure_blob._page_cache.clear()
+    second = call(10, first.next_page_parameters)
+
+    assert names(second) == ['b']
+    assert service.fetches['1'] == 2
+
+
+def test_expired_prefetch_is_replaced(azure_blob, browse):
+    service, call = browse({None: ([blob('a')], '1'), '1': ([blob('b')], None)})
+
+    first = call(10)
+    wait_for_prefetches(azure_blob)
+    for key, (_, future) in list(azure_blob._page_cache.items()):
+        azure_blob._page_cache[key] = (0, future)
+
+    # Listing the first page again schedules a fresh prefetch instead of keeping the expired one
+    call(10)
+    assert all(expires_at > time.monotonic() for expires_at, _ in azure_blob._page_cache.values())
+    wait_for_prefetches(azure_blob)
+    fetched = service.fetches['1']
+    second = call(10, first.next_page_parameters)
+
+    assert names(second) == ['b']
+    assert service.fetches['1'] == fetched == 2
+
+
+def test_container_listing_reads_token_from_pager(azure_blob, browse):
+    containers = {None: ([types.SimpleNamespace(name='alpha', last_modified=None, etag='"1"')], 'next')}
+    service, call = browse(containers)
+
+    bucket = call(10, bucket=None)
+
+    assert names(bucket) == ['alpha']
+    assert bucket.next_page_parameters == {'continuation_token': 'next'}
+
+
+def test_iso_keeps_timezone_of_equal_datetimes(azure_blob):
+    utc = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    plus_one = datetime(2024, 1, 1, 1, 0, tzinfo=timezone(timedelta(hours=1)))
+
+    assert azure_blob._iso(utc) == '2024-01-01T00:00:00+00:00'
+    assert azure_blob._iso(plus_one) == '2024-01-01T01:00:00+01:00'
+    assert azure_blob._iso(None) == ''